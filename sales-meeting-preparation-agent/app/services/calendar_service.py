@@ -12,7 +12,7 @@ class CalendarService:
     
     def _load_data(self):
         """Load meeting data from JSON files."""
-        with open(os.path.join(self.data_dir, "upcoming_meetings.json"), "r") as f:
+        with open(os.path.join(self.data_dir, "upcoming_meetings.json"), "r", encoding="utf-8") as f:
             self.meetings = json.load(f)
     
     def get_meeting_by_id(self, meeting_id: str) -> Optional[Dict[str, Any]]:
@@ -12,13 +12,13 @@ class CRMService:
     
     def _load_data(self):
         """Load customer data from JSON files."""
-        with open(os.path.join(self.data_dir, "customers.json"), "r") as f:
+        with open(os.path.join(self.data_dir, "customers.json"), "r", encoding="utf-8") as f:
             self.customers = json.load(f)
         
-        with open(os.path.join(self.data_dir, "interactions.json"), "r") as f:
+        with open(os.path.join(self.data_dir, "interactions.json"), "r", encoding="utf-8") as f:
             self.interactions = json.load(f)
         
-        with open(os.path.join(self.data_dir, "transactions.json"), "r") as f:
+        with open(os.path.join(self.data_dir, "transactions.json"), "r", encoding="utf-8") as f:
             self.transactions = json.load(f)
     
     def get_customer_by_id(self, customer_id: str) -> Optional[Dict[str, Any]]:
@@ -11,7 +11,7 @@ class ProductService:
     
     def _load_data(self):
         """Load product data from JSON files."""
-        with open(os.path.join(self.data_dir, "product_catalog.json"), "r") as f:
+        with open(os.path.join(self.data_dir, "product_catalog.json"), "r", encoding="utf-8") as f:
             self.product_catalog = json.load(f)
         
         # Create a flat list of all products for easier searching
@@ -1,161 +1,71 @@
 # app/utils/mock_data_generator.py
 import json
 import os
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import random
 import argparse
+import multiprocessing
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-# Define region-specific data dictionaries
-REGION_DATA = {
-    "USA": {
-        "company_names": [
-            "American Construction Corp", "Elite Design Studio", "Metro Public Schools", 
-            "Oceanview Hotels Group", "Greenfield Landscaping", "Cornerstone Development",
-            "Liberty Contractors", "Starlight Interiors", "Vista Property Management",
-            "Northstar Building Solutions"
-        ],
-        "person_names": [
-            "John Smith", "Emily Johnson", "Robert Williams", "Lisa Chen", "Michael Garcia",
-            "Jessica Brown", "David Miller", "Sarah Wilson", "James Taylor", "Jennifer Davis"
-        ],
-        "locations": [
-            "Chicago, IL", "New York, NY", "Boston, MA", "Miami, FL", "Austin, TX",
-            "San Francisco, CA", "Seattle, WA", "Denver, CO", "Atlanta, GA", "Phoenix, AZ"
-        ],
-        "currency": "USD",
-        "currency_symbol": "$",
-        "phone_format": "555-###-####",
-        "projects": {
-            "Construction": ["suburban housing development", "downtown office renovation", "industrial warehouse construction", "shopping mall expansion"],
-            "Interior Design": ["luxury condominium redesign", "upscale restaurant interior", "corporate headquarters styling", "boutique hotel rooms"],
-            "Education": ["public school renovation", "university campus refresh", "sports facility update", "administration building modernization"],
-            "Hospitality": ["beach resort renovation", "downtown hotel update", "steakhouse redesign", "convention center refresh"],
-            "Landscaping": ["residential garden project", "commercial property landscaping", "public park renovation", "golf course maintenance"]
-        }
-    },
-    "INDIA": {
-        "company_names": [
-            "Bharat Constructions", "Elegant Interiors", "Metro Education Society", 
-            "Taj Hospitality Group", "Green Earth Landscaping", "Sunrise Developers",
-            "Reliable Contractors", "Amrit Design Studio", "Prism Property Services",
-            "Ashoka Building Solutions"
-        ],
-        "person_names": [
-            "Rajesh Kumar", "Priya Sharma", "Vikram Patel", "Anita Singh", "Suresh Mehta",
-            "Neha Gupta", "Amit Verma", "Sunita Reddy", "Rahul Joshi", "Deepa Chakraborty"
-        ],
-        "locations": [
-            "Mumbai, Maharashtra", "Delhi, NCR", "Bangalore, Karnataka", "Hyderabad, Telangana", "Chennai, Tamil Nadu",
-            "Pune, Maharashtra", "Kolkata, West Bengal", "Ahmedabad, Gujarat", "Jaipur, Rajasthan", "Kochi, Kerala"
-        ],
-        "currency": "INR",
-        "currency_symbol": "₹",
-        "phone_format": "+91 ##### #####",
-        "projects": {
-            "Construction": ["township development", "IT park construction", "commercial complex building", "residential high-rise"],
-            "Interior Design": ["luxury apartment styling", "premium restaurant design", "corporate office interiors", "heritage hotel renovation"],
-            "Education": ["school campus renovation", "university building refresh", "sports complex update", "administrative block modernization"],
-            "Hospitality": ["resort renovation", "business hotel update", "fine dining restaurant redesign", "convention hall refresh"],
-            "Landscaping": ["farmhouse garden project", "corporate campus landscaping", "municipal park development", "temple grounds maintenance"]
-        }
-    },
-    "APAC": {
-        "company_names": [
-            "Asia Pacific Builders", "Orient Design Studio", "East West Education Group", 
-            "Pacific Rim Hospitality", "Harmony Landscaping", "Bamboo Development",
-            "Dragon Contractors", "Sakura Interiors", "Eastern Star Properties",
-            "Golden Bridge Construction"
-        ],
-        "person_names": [
-            "Wei Chen", "Sakura Tanaka", "Min-ho Kim", "Mei Ling Wong", "Raj Patel",
-            "Ji-eun Park", "Hiroshi Nakamura", "Lakshmi Nair", "Xiao Wang", "Nguyen Tran"
-        ],
-        "locations": [
-            "Singapore", "Tokyo, Japan", "Seoul, South Korea", "Hong Kong", "Bangkok, Thailand",
-            "Shanghai, China", "Kuala Lumpur, Malaysia", "Manila, Philippines", "Jakarta, Indonesia", "Taipei, Taiwan"
-        ],
-        "currency": "Multiple",
-        "currency_symbol": "$",
-        "phone_format": "+## ### ### ####",
-        "projects": {
-            "Construction": ["high-rise apartment complex", "technology park development", "commercial tower construction", "mixed-use development"],
-            "Interior Design": ["luxury residence styling", "hotel chain standardization", "multinational office design", "shopping mall interior"],
-            "Education": ["international school renovation", "university campus modernization", "technology center development", "language academy design"],
-            "Hospitality": ["beach resort renovation", "business hotel chain update", "fine dining franchise design", "convention center modernization"],
-            "Landscaping": ["tropical garden design", "commercial complex landscaping", "public water garden development", "corporate campus environments"]
-        }
-    },
-    "ANZ": {
-        "company_names": [
-            "Aussie Construction Group", "Kiwi Design Studio", "Southern Cross Education", 
-            "Pacific Hospitality Holdings", "Down Under Landscaping", "Oceanic Developers",
-            "Outback Contractors", "Harbor City Interiors", "Tasman Property Management",
-            "Wellington Building Solutions"
-        ],
-        "person_names": [
-            "James Wilson", "Emma Thompson", "Jack Robinson", "Olivia Mitchell", "William Taylor",
-            "Charlotte Anderson", "Thomas Campbell", "Jessica Martin", "Oliver Davies", "Sophie Clark"
-        ],
-        "locations": [
-            "Sydney, NSW", "Melbourne, VIC", "Brisbane, QLD", "Perth, WA", "Adelaide, SA",
-            "Auckland, NZ", "Wellington, NZ", "Christchurch, NZ", "Gold Coast, QLD", "Canberra, ACT"
-        ],
-        "currency": "AUD/NZD",
-        "currency_symbol": "$",
-        "phone_format": "+61 # #### ####",
-        "projects": {
-            "Construction": ["beachfront development", "urban apartment construction", "outback commercial complex", "sports stadium renovation"],
-            "Interior Design": ["coastal residence styling", "winery restaurant design", "corporate headquarters update", "boutique hotel concept"],
-            "Education": ["primary school modernization", "university campus redevelopment", "sports academy facilities", "technical college update"],
-            "Hospitality": ["harbor view hotel renovation", "winery tourism facilities", "seafood restaurant redesign", "conference center development"],
-            "Landscaping": ["drought-resistant garden design", "native flora landscaping", "public park renovation", "coastal property environments"]
-        }
-    },
-    "MEA": {
-        "company_names": [
-            "Al Faisal Construction", "Mediterranean Design Studio", "Gulf Education Institute", 
-            "Sahara Hospitality Group", "Oasis Landscaping", "Atlas Development",
-            "Pyramid Contractors", "Arabian Interiors", "Levant Property Services",
-            "Al Jazeera Building Solutions"
-        ],
-        "person_names": [
-            "Mohammed Al-Farsi", "Fatima Hassan", "Ahmed El-Masri", "Leila Karimi", "Yusuf Ibrahim",
-            "Noor Al-Sayed", "Omar Sheikh", "Aisha Mahmoud", "Tariq Rahman", "Zainab Al-Mansour"
-        ],
-        "locations": [
-            "Dubai, UAE", "Cairo, Egypt", "Riyadh, Saudi Arabia", "Doha, Qatar", "Johannesburg, South Africa",
-            "Istanbul, Turkey", "Casablanca, Morocco", "Abu Dhabi, UAE", "Nairobi, Kenya", "Tel Aviv, Israel"
-        ],
-        "currency": "Multiple",
-        "currency_symbol": "$",
-        "phone_format": "+### ## ### ####",
-        "projects": {
-            "Construction": ["luxury villa complex", "commercial tower development", "resort construction", "urban shopping district"],
-            "Interior Design": ["royal residence styling", "desert resort interiors", "international hotel design", "commercial plaza concept"],
-            "Education": ["international academy construction", "university campus modernization", "private school renovation", "research center development"],
-            "Hospitality": ["beach resort renovation", "business hotel development", "heritage restaurant design", "conference facility construction"],
-            "Landscaping": ["desert garden design", "water conservation landscaping", "royal palace grounds", "commercial complex environments"]
-        }
-    }
-}
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Region-specific data lives in one JSON file per region and is only loaded on demand
+REGIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "regions")
+
+@lru_cache(maxsize=None)
+def region_names():
+    """List the available regions from the data files, scanning the directory once."""
+    return tuple(sorted(
+        os.path.splitext(filename)[0] for filename in os.listdir(REGIONS_DIR) if filename.endswith(".json")
+    ))
+
+# Immutable per-region view of the region data: tuples index faster than lists
+# and attribute access avoids a dict lookup in the per-customer loops
+Region = namedtuple("Region", [
+    "company_names", "person_names", "locations",
+    "currency", "currency_symbol", "phone_format", "projects",
+    "email_locals", "email_domains"
+])
 
-# Ensure directories exist
-os.makedirs("data/crm", exist_ok=True)
-os.makedirs("data/calendar", exist_ok=True)
-os.makedirs("data/products", exist_ok=True)
+@lru_cache(maxsize=None)
+def load_region(name):
+    """Load a region's data file and build its Region, once per process."""
+    with open(os.path.join(REGIONS_DIR, f"{name}.json"), "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return Region(
+        company_names=tuple(data["company_names"]),
+        person_names=tuple(data["person_names"]),
+        locations=tuple(data["locations"]),
+        currency=data["currency"],
+        currency_symbol=data["currency_symbol"],
+        phone_format=data["phone_format"],
+        projects={industry: tuple(projects) for industry, projects in data["projects"].items()},
+        # Sanitized email fragments, computed once per name in the pools
+        email_locals={person: person.lower().replace(' ', '.') for person in data["person_names"]},
+        email_domains={company: company.lower().replace(' ', '') for company in data["company_names"]}
+    )
 
 # Get current date for dynamic generation
 CURRENT_DATE = datetime.now()
 
+# Shared generator for the batched draws in the interaction/transaction loops
+rng = np.random.default_rng()
+
 def get_region_data(region_or_country):
     """Get region-specific data based on input parameter."""
     region_or_country = region_or_country.upper()
-    if region_or_country in REGION_DATA:
-        return REGION_DATA[region_or_country]
+    if region_or_country in region_names():
+        return load_region(region_or_country)
     else:
         print(f"Warning: Region/country '{region_or_country}' not found. Using USA as default.")
-        return REGION_DATA["USA"]
+        return load_region("USA")
 
 def generate_customers(region_data, num_customers=5):
     """Generate customer data with region-specific information."""
@@ -164,46 +74,72 @@ def generate_customers(region_data, num_customers=5):
     industries = ["Construction", "Interior Design", "Education", "Hospitality", "Landscaping"]
     segments = ["Commercial", "Residential", "Institutional", "Luxury Residential", "Industrial"]
     sizes = ["Small", "Medium", "Large"]
+    titles = ["Purchasing Manager", "Operations Director", "Facilities Manager", "Owner", "CEO", "Project Manager"]
+    
+    # Bind the region pools to locals once so the loop body uses fast local lookups
+    company_names = region_data.company_names
+    locations = region_data.locations
+    person_names = region_data.person_names
+    phone_format = region_data.phone_format
+    email_locals = region_data.email_locals
+    email_domains = region_data.email_domains
+    
+    # Company names already handed out, for O(1) duplicate checks
+    seen_names = set()
+    
+    # Draw every per-customer pick in one random.choices call per field
+    picked_industries = random.choices(industries, k=num_customers)
+    picked_company_names = random.choices(company_names, k=num_customers)
+    picked_locations = random.choices(locations, k=num_customers)
+    picked_contacts = random.choices(person_names, k=num_customers)
+    picked_sizes = random.choices(sizes, k=num_customers)
+    picked_titles = random.choices(titles, k=num_customers)
+    picked_segments = random.choices(segments, k=num_customers)
+    picked_relationship_days = random.choices(range(365, 365*5 + 1), k=num_customers)
+    picked_revenues = random.choices(range(500, 25001), k=num_customers)
+    phone_digit_count = phone_format.count('#')
     
     for i in range(1, num_customers + 1):
-        industry = random.choice(industries)
+        n = i - 1
+        industry = picked_industries[n]
         
         # Randomly select company name and location from region-specific data
-        company_name = random.choice(region_data["company_names"])
-        if i > 1 and company_name in [c["name"] for c in customers]:
+        base_company_name = picked_company_names[n]
+        company_name = base_company_name
+        company_suffix = ""
+        suffix = i
+        while company_name in seen_names:
             # Avoid duplicate names by adding a suffix
-            company_name = f"{company_name} {chr(64+i)}"
+            company_suffix = chr(64+suffix)
+            company_name = f"{base_company_name} {company_suffix}"
+            suffix += 1
+        seen_names.add(company_name)
             
-        location = random.choice(region_data["locations"])
-        contact_name = random.choice(region_data["person_names"])
+        location = picked_locations[n]
+        contact_name = picked_contacts[n]
         
         # Generate a region-appropriate phone number
-        phone_format = region_data["phone_format"]
-        phone = ""
-        for char in phone_format:
-            if char == '#':
-                phone += str(random.randint(0, 9))
-            else:
-                phone += char
+        digits = iter(random.choices("0123456789", k=phone_digit_count))
+        phone = "".join(next(digits) if char == '#' else char for char in phone_format)
         
         # Generate a reasonable relationship start date
-        relationship_since = (CURRENT_DATE - timedelta(days=random.randint(365, 365*5))).strftime("%Y-%m-%d")
+        relationship_since = (CURRENT_DATE - timedelta(days=picked_relationship_days[n])).strftime("%Y-%m-%d")
         
         customers.append({
             "id": f"C{i:03d}",
             "name": company_name,
             "industry": industry,
-            "size": random.choice(sizes),
+            "size": picked_sizes[n],
             "relationship_since": relationship_since,
             "primary_contact": {
                 "name": contact_name,
-                "title": random.choice(["Purchasing Manager", "Operations Director", "Facilities Manager", "Owner", "CEO", "Project Manager"]),
-                "email": f"{contact_name.lower().replace(' ', '.')}@{company_name.lower().replace(' ', '')}.example",
+                "title": picked_titles[n],
+                "email": f"{email_locals[contact_name]}@{email_domains[base_company_name]}{company_suffix.lower()}.example",
                 "phone": phone
             },
-            "annual_revenue": random.randint(500, 25000) * 1000,
+            "annual_revenue": picked_revenues[n] * 1000,
             "location": location,
-            "segment": random.choice(segments)
+            "segment": picked_segments[n]
         })
     
     return customers
@@ -283,12 +219,30 @@ interaction_templates = {
         "Showcased durability features of {product} compared to competitor products. {contact} was impressed."
     ]
 }
+# Every (type, template) pair, so a product interaction needs a single draw
+flat_interaction_templates = [
+    (interaction_type, template)
+    for interaction_type, templates in interaction_templates.items()
+    for template in templates
+]
+
+interaction_sentiments = [
+    " Customer seemed very satisfied with our previous products.",
+    " There were some concerns about price point.",
+    " They mentioned they're also considering competitor products.",
+    " Customer emphasized timeline constraints for delivery.",
+    " They expressed strong preference for our brand over competitors."
+]
 
 # Generate past interactions with dynamic dates and region-specific projects
-def generate_interactions(customers, products, region_data):
+def generate_interactions(customers, products, region_data, products_by_id=None):
     all_interactions = []
     interaction_id = 1
     
+    # Index products by ID once instead of scanning the list for every lookup
+    if products_by_id is None:
+        products_by_id = {p["id"]: p for p in products}
+    
     # Use dynamic date range based on current date
     end_date = CURRENT_DATE
     
@@ -300,77 +254,85 @@ def generate_interactions(customers, products, region_data):
         # More established customers have more interactions
         num_interactions = min(50, max(5, relationship_duration // 30))
         
-        # Generate random interaction dates between relationship start and now
-        interaction_dates = []
+        # Generate random interaction dates between relationship start and now,
+        # sorted by date (oldest to newest)
         date_range = (end_date - relationship_start).days
-        for _ in range(num_interactions):
-            days_ago = random.randint(0, date_range)
-            interaction_date = end_date - timedelta(days=days_ago)
-            interaction_dates.append(interaction_date)
-        
-        # Sort by date (oldest to newest)
-        interaction_dates = sorted(interaction_dates)
+        days_ago = np.sort(rng.integers(0, date_range + 1, num_interactions))[::-1]
+        date_index = end_date - pd.to_timedelta(days_ago, unit="D")
+        interaction_dates = date_index.to_pydatetime().tolist()
+        # Format every date string for this customer in one vectorized pass
+        date_strings = date_index.strftime("%Y-%m-%d").tolist()
         
         # Customer's industry-specific projects from regional data
         industry = customer["industry"]
-        customer_projects = region_data["projects"].get(
+        customer_projects = region_data.projects.get(
             industry, 
-            ["construction project", "renovation project", "painting project"]
+            ("construction project", "renovation project", "painting project")
         )
+        customer_id = customer["id"]
+        contact_name = customer["primary_contact"]["name"]
         
-        # Track which products this customer has shown interest in or purchased
+        # Draw all random decisions for this customer's interactions up front
+        is_general = (rng.random(num_interactions) < 0.2).tolist()
+        reuse_product = (rng.random(num_interactions) < 0.6).tolist()
+        reuse_pick = rng.random(num_interactions).tolist()
+        product_idx = rng.integers(0, len(products), num_interactions).tolist()
+        type_idx = rng.integers(0, len(interaction_types), num_interactions).tolist()
+        template_idx = rng.integers(0, len(flat_interaction_templates), num_interactions).tolist()
+        project_idx = rng.integers(0, len(customer_projects), num_interactions).tolist()
+        add_sentiment = (rng.random(num_interactions) < 0.3).tolist()
+        sentiment_idx = rng.integers(0, len(interaction_sentiments), num_interactions).tolist()
+        
+        # Track which products this customer has shown interest in or purchased;
+        # the list mirrors the set so a random pick doesn't need to copy it
         customer_products = set()
+        customer_products_list = []
         
         # Generate interactions
-        for date in interaction_dates:
+        for k, date in enumerate(interaction_dates):
             # Occasional interactions don't mention specific products (general relationship building)
-            if random.random() < 0.2:
-                interaction_type = random.choice(interaction_types)
-                notes = f"General check-in with {customer['primary_contact']['name']}. Discussed upcoming needs and maintained relationship."
+            if is_general[k]:
+                interaction_type = interaction_types[type_idx[k]]
+                notes = f"General check-in with {contact_name}. Discussed upcoming needs and maintained relationship."
                 product_mentioned = None
             else:
                 # Select a product, with higher probability for previously mentioned products
-                if customer_products and random.random() < 0.6:
-                    product_id = random.choice(list(customer_products))
+                if customer_products_list and reuse_product[k]:
+                    product_id = customer_products_list[int(reuse_pick[k] * len(customer_products_list))]
                     # Find the full product object for this ID
-                    product_mentioned = next((p for p in products if p["id"] == product_id), None)
+                    product_mentioned = products_by_id.get(product_id)
                     if product_mentioned is None:
                         # Fallback in case product isn't found
-                        product_mentioned = random.choice(products)
+                        product_mentioned = products[product_idx[k]]
                 else:
-                    product_mentioned = random.choice(products)
-                    customer_products.add(product_mentioned["id"])
-                
-                interaction_type = random.choice(interaction_types)
+                    product_mentioned = products[product_idx[k]]
+                    if product_mentioned["id"] not in customer_products:
+                        customer_products.add(product_mentioned["id"])
+                        customer_products_list.append(product_mentioned["id"])
                 
                 # Generate notes using templates
-                template = random.choice(interaction_templates[interaction_type])
-                project = random.choice(customer_projects)
+                interaction_type, template = flat_interaction_templates[template_idx[k]]
+                project = customer_projects[project_idx[k]]
                 notes = template.format(
                     product=product_mentioned["name"], 
-                    contact=customer["primary_contact"]["name"],
+                    contact=contact_name,
                     project=project
                 )
                 
                 # Add some sentiment occasionally
-                if random.random() < 0.3:
-                    sentiments = [
-                        " Customer seemed very satisfied with our previous products.",
-                        " There were some concerns about price point.",
-                        " They mentioned they're also considering competitor products.",
-                        " Customer emphasized timeline constraints for delivery.",
-                        " They expressed strong preference for our brand over competitors."
-                    ]
-                    notes += random.choice(sentiments)
+                if add_sentiment[k]:
+                    notes += interaction_sentiments[sentiment_idx[k]]
             
             interaction = {
                 "id": f"INT{interaction_id:04d}",
-                "customer_id": customer["id"],
-                "date": date.strftime("%Y-%m-%d"),
+                "customer_id": customer_id,
+                "date": date_strings[k],
                 "type": interaction_type,
-                "participants": [customer["primary_contact"]["name"], "Sales Representative"],
+                "participants": [contact_name, "Sales Representative"],
                 "notes": notes,
-                "product_id": product_mentioned["id"] if product_mentioned else None
+                "product_id": product_mentioned["id"] if product_mentioned else None,
+                # Keep the parsed date around for generate_transactions; stripped before saving
+                "_date_obj": date
             }
             
             all_interactions.append(interaction)
@@ -383,91 +345,110 @@ def generate_transactions(customers, products, interactions, region_data):
     transactions = []
     transaction_id = 1
     
+    # Positional index and price vector so line-item math can run on arrays
+    product_positions = {p["id"]: idx for idx, p in enumerate(products)}
+    base_prices = np.array([p["base_price"] for p in products], dtype=float)
+    
     # Currency symbol for formatting
-    currency_symbol = region_data["currency_symbol"]
+    currency_symbol = region_data.currency_symbol
+    
+    # Group interactions by customer in a single pass
+    interactions_by_customer = defaultdict(list)
+    for interaction in interactions:
+        interactions_by_customer[interaction["customer_id"]].append(interaction)
     
     for customer in customers:
         # Determine number of transactions based on customer size
         if customer["size"] == "Large":
-            num_transactions = random.randint(8, 15)
+            num_transactions = int(rng.integers(8, 16))
         elif customer["size"] == "Medium":
-            num_transactions = random.randint(5, 10)
+            num_transactions = int(rng.integers(5, 11))
         else:
-            num_transactions = random.randint(2, 7)
+            num_transactions = int(rng.integers(2, 8))
         
         # Customer's interactions to extract product interests
-        customer_interactions = [i for i in interactions if i["customer_id"] == customer["id"]]
+        customer_interactions = interactions_by_customer.get(customer["id"], [])
         
-        # Extract products mentioned in interactions
-        product_interests = [i["product_id"] for i in customer_interactions if i["product_id"]]
+        # Extract products mentioned in interactions, as positions into `products`
+        product_interests = np.array([
+            product_positions[i["product_id"]] for i in customer_interactions
+            if i["product_id"] in product_positions
+        ], dtype=int)
         
         # Get interaction dates to align transactions
-        interaction_dates = [datetime.strptime(i["date"], "%Y-%m-%d") for i in customer_interactions]
+        interaction_dates = [
+            i.get("_date_obj") or datetime.strptime(i["date"], "%Y-%m-%d")
+            for i in customer_interactions
+        ]
         
         # No transactions if no interactions
         if not interaction_dates:
             continue
+        
+        # Draw the per-transaction random decisions for this customer up front
+        base_date_idx = rng.integers(0, len(interaction_dates), num_transactions)
+        days_after = rng.integers(3, 15, num_transactions)
+        days_before_now = rng.integers(1, 8, num_transactions)
+        num_products_per_txn = rng.integers(1, 6, num_transactions).tolist()
+        prefer_interests = (rng.random(num_transactions) < 0.8).tolist()
+        
+        # Transactions usually occur after interactions discussing products:
+        # pick a random interaction date and add a few days
+        transaction_dates = pd.DatetimeIndex(interaction_dates)[base_date_idx] + pd.to_timedelta(days_after, unit="D")
+        
+        # Make sure transaction dates aren't in the future
+        transaction_dates = transaction_dates.where(
+            transaction_dates <= CURRENT_DATE,
+            CURRENT_DATE - pd.to_timedelta(days_before_now, unit="D")
+        )
+        transaction_date_strings = transaction_dates.strftime("%Y-%m-%d").tolist()
             
-        for _ in range(num_transactions):
-            # Transactions usually occur after interactions discussing products
-            # Pick a random interaction date and add a few days
-            base_date = random.choice(interaction_dates)
-            transaction_date = base_date + timedelta(days=random.randint(3, 14))
-            
-            # Make sure transaction date isn't in the future
-            if transaction_date > CURRENT_DATE:
-                transaction_date = CURRENT_DATE - timedelta(days=random.randint(1, 7))
-            
-            # Transaction details
-            line_items = []
-            
+        for t in range(num_transactions):
             # Number of products in this transaction
-            num_products = random.randint(1, 5)
+            num_products = num_products_per_txn[t]
+            
+            # Per-line-item draws: quantities, discounts and product picks
+            quantities = rng.integers(1, 11, num_products)
+            discounts = rng.uniform(0, 0.15, num_products)
+            product_idx = rng.integers(0, len(products), num_products)
             
             # Prefer products the customer has shown interest in
-            if product_interests and random.random() < 0.8:
+            if len(product_interests) and prefer_interests[t]:
                 # Select products of interest, with possible repeats
-                for _ in range(min(num_products, len(product_interests))):
-                    product_id = random.choice(product_interests)
-                    product = next((p for p in products if p["id"] == product_id), None)
-                    
-                    if product:
-                        quantity = random.randint(1, 10)
-                        unit_price = product["base_price"] * (1 - random.uniform(0, 0.15))  # Apply some discount
-                        
-                        line_items.append({
-                            "product_id": product["id"],
-                            "product_name": product["name"],
-                            "quantity": quantity,
-                            "unit_price": round(unit_price, 2),
-                            "extended_price": round(quantity * unit_price, 2)
-                        })
+                num_interests = min(num_products, len(product_interests))
+                interest_idx = rng.integers(0, len(product_interests), num_interests)
+                product_idx[:num_interests] = product_interests[interest_idx]
             
-            # Add some random products if needed
-            while len(line_items) < num_products:
-                product = random.choice(products)
-                
-                quantity = random.randint(1, 10)
-                unit_price = product["base_price"] * (1 - random.uniform(0, 0.15))  # Apply some discount
-                
-                line_items.append({
-                    "product_id": product["id"],
-                    "product_name": product["name"],
+            # Apply some discount and price every line item in one pass
+            unit_prices = base_prices[product_idx] * (1 - discounts)
+            # Round both price columns with a single np.round call
+            unit_prices, extended_prices = np.round(np.stack((unit_prices, quantities * unit_prices)), 2)
+            
+            # Transaction details
+            line_items = [
+                {
+                    "product_id": products[idx]["id"],
+                    "product_name": products[idx]["name"],
                     "quantity": quantity,
-                    "unit_price": round(unit_price, 2),
-                    "extended_price": round(quantity * unit_price, 2)
-                })
+                    "unit_price": unit_price,
+                    "extended_price": extended_price
+                }
+                for idx, quantity, unit_price, extended_price in zip(
+                    product_idx.tolist(), quantities.tolist(),
+                    unit_prices.tolist(), extended_prices.tolist()
+                )
+            ]
             
             # Calculate total
-            total_amount = sum(item["extended_price"] for item in line_items)
+            total_amount = float(extended_prices.sum())
             
             transaction = {
                 "id": f"TRX{transaction_id:04d}",
                 "customer_id": customer["id"],
-                "date": transaction_date.strftime("%Y-%m-%d"),
+                "date": transaction_date_strings[t],
                 "status": "Completed",
                 "currency_symbol": currency_symbol,
-                "currency": region_data["currency"],
+                "currency": region_data.currency,
                 "line_items": line_items,
                 "total_amount": round(total_amount, 2)
             }
@@ -485,31 +466,44 @@ def generate_upcoming_meetings(customers):
     # Generate meetings for the next 14 days from current date
     today = CURRENT_DATE
     
-    for customer in customers:
+    # Different meeting types
+    meeting_types = ["Quarterly Review", "Product Consultation", "Project Planning", "Follow-up", "New Product Introduction"]
+    
+    # Possible meeting locations; customer office gets extra weight if the customer has a location
+    possible_locations = ["Customer Office", "Video Call", "Phone Call", "ABC Paints Office"]
+    customer_office_weights = [3, 1, 1, 1]
+    
+    # Draw every per-customer pick up front in batched random.choices calls
+    num_customers = len(customers)
+    picked_times = random.choices(range(8, 17), k=num_customers)
+    picked_durations = random.choices([30, 60, 90], k=num_customers)
+    picked_types = random.choices(meeting_types, k=num_customers)
+    picked_weighted_locations = random.choices(possible_locations, weights=customer_office_weights, k=num_customers)
+    picked_locations = random.choices(possible_locations, k=num_customers)
+    
+    # Meeting date in the next 1-14 days, formatted for all customers at once
+    days_ahead = random.choices(range(1, 15), k=num_customers)
+    meeting_dates = (today + pd.to_timedelta(days_ahead, unit="D")).strftime("%Y-%m-%d").tolist()
+    
+    for n, (customer, meeting_date) in enumerate(zip(customers, meeting_dates)):
         # 80% chance each customer has an upcoming meeting
         if random.random() < 0.8:
-            # Meeting date in the next 1-14 days
-            meeting_date = today + timedelta(days=random.randint(1, 14))
-            
-            # Different meeting types
-            meeting_types = ["Quarterly Review", "Product Consultation", "Project Planning", "Follow-up", "New Product Introduction"]
-            
             # Determine location based on customer's location
-            possible_locations = ["Customer Office", "Video Call", "Phone Call", "ABC Paints Office"]
-            # Add weight to customer office if customer has a location
             if customer.get("location"):
-                possible_locations.extend(["Customer Office"] * 2)
+                location = picked_weighted_locations[n]
+            else:
+                location = picked_locations[n]
             
             meeting = {
                 "id": f"MTG{meeting_id:04d}",
                 "customer_id": customer["id"],
                 "customer_name": customer["name"],
                 "contact_name": customer["primary_contact"]["name"],
-                "date": meeting_date.strftime("%Y-%m-%d"),
-                "time": f"{random.randint(8, 16):02d}:00",
-                "duration_minutes": random.choice([30, 60, 90]),
-                "type": random.choice(meeting_types),
-                "location": random.choice(possible_locations),
+                "date": meeting_date,
+                "time": f"{picked_times[n]:02d}:00",
+                "duration_minutes": picked_durations[n],
+                "type": picked_types[n],
+                "location": location,
                 "description": f"Meeting with {customer['name']} to discuss their current and upcoming needs."
             }
             
@@ -518,21 +512,34 @@ def generate_upcoming_meetings(customers):
     
     return upcoming_meetings
 
-def main():
-    # Parse command line arguments
-    parser = argparse.ArgumentParser(description='Generate mock data for ABC Paints Sales Meeting Preparation Agent')
-    parser.add_argument('--region', default='USA', help='Region or country to generate data for (USA, INDIA, APAC, ANZ, MEA)')
-    args = parser.parse_args()
-    
+def save_to_json(data, filename):
+    """Serialize data to a UTF-8 JSON file with 2-space indentation."""
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        # orjson always writes raw UTF-8 (e.g. the rupee sign), so the fallback does
+        # too; both paths then produce the same file whatever the locale
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+def save_to_parquet(records, filename):
+    """Write a list of flat records to Parquet, building the frame column by column."""
+    columns = {key: [record[key] for record in records] for key in records[0]} if records else {}
+    pd.DataFrame(columns).to_parquet(filename, index=False)
+
+def generate_for_region(region, output_dir="data", output_format="json"):
+    """Generate and save the full mock data set for one region under output_dir."""
     # Get region-specific data
-    region_data = get_region_data(args.region)
+    region_data = get_region_data(region)
     
-    print(f"Generating mock data for region: {args.region}")
+    print(f"Generating mock data for region: {region}")
     
     # Generate data
     customers = generate_customers(region_data)
-    products = get_products()
-    interactions = generate_interactions(customers, products, region_data)
+    products = tuple(get_products())
+    products_by_id = {p["id"]: p for p in products}
+    interactions = generate_interactions(customers, products, region_data, products_by_id)
     transactions = generate_transactions(customers, products, interactions, region_data)
     upcoming_meetings = generate_upcoming_meetings(customers)
     
@@ -544,20 +551,55 @@ def main():
             products_by_category[category] = []
         products_by_category[category].append(product)
     
-    # Save all data to files
-    def save_to_json(data, filename):
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+    # Drop the in-memory date objects before serialization
+    for interaction in interactions:
+        interaction.pop("_date_obj", None)
     
-    save_to_json(customers, "data/crm/customers.json")
-    save_to_json(interactions, "data/crm/interactions.json")
-    save_to_json(transactions, "data/crm/transactions.json")
-    save_to_json(products_by_category, "data/products/product_catalog.json")
-    save_to_json(upcoming_meetings, "data/calendar/upcoming_meetings.json")
+    # Ensure output directories exist
+    for subdir in ("crm", "calendar", "products"):
+        os.makedirs(os.path.join(output_dir, subdir), exist_ok=True)
+    
+    # Save all data to files; the writes are independent, so overlap them
+    outputs = [
+        (customers, os.path.join(output_dir, "crm", "customers.json")),
+        (interactions, os.path.join(output_dir, "crm", "interactions.json")),
+        (transactions, os.path.join(output_dir, "crm", "transactions.json")),
+        (products_by_category, os.path.join(output_dir, "products", "product_catalog.json")),
+        (upcoming_meetings, os.path.join(output_dir, "calendar", "upcoming_meetings.json"))
+    ]
+    with ThreadPoolExecutor(max_workers=len(outputs)) as executor:
+        # list() re-raises any write error from the workers
+        list(executor.map(lambda output: save_to_json(*output), outputs))
+    
+    # The app reads the JSON files; Parquet copies of the large CRM tables are for analysis
+    if output_format == "parquet":
+        save_to_parquet(interactions, os.path.join(output_dir, "crm", "interactions.parquet"))
+        save_to_parquet(transactions, os.path.join(output_dir, "crm", "transactions.parquet"))
     
     print(f"Mock data generation complete with current date: {CURRENT_DATE.strftime('%Y-%m-%d')}")
-    print(f"Generated data for region: {args.region}")
+    print(f"Generated data for region: {region}")
     print(f"Generated {len(customers)} customers, {len(interactions)} interactions, {len(transactions)} transactions, and {len(upcoming_meetings)} upcoming meetings")
 
+def _generate_region_subdir(region, output_format):
+    """Pool worker: generate one region into its own data/<region> directory."""
+    generate_for_region(region, os.path.join("data", region), output_format)
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Generate mock data for ABC Paints Sales Meeting Preparation Agent')
+    parser.add_argument('--region', default='USA', help='Region or country to generate data for (USA, INDIA, APAC, ANZ, MEA, or ALL)')
+    parser.add_argument('--format', default='json', choices=['json', 'parquet'], help='Also write interactions/transactions as Parquet when set to parquet')
+    args = parser.parse_args()
+    
+    if args.region.upper() == "ALL":
+        # Regions share no state, so generate them in parallel worker processes.
+        # forkserver/spawn give each worker a freshly seeded RNG rather than a forked copy.
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        regions = region_names()
+        with multiprocessing.get_context(start_method).Pool(len(regions)) as pool:
+            pool.starmap(_generate_region_subdir, [(region, args.format) for region in regions])
+    else:
+        generate_for_region(args.region, output_format=args.format)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
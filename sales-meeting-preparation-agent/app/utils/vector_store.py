@@ -1,13 +1,234 @@
+import hashlib
 import os
+import platform
+import threading
 from typing import Dict, List, Any, Optional
-import json
+import orjson
+import numpy as np
+import chromadb
+import onnxruntime as ort
+from huggingface_hub import hf_hub_download
+from tokenizers import Tokenizer
 from langchain_community.vectorstores import Chroma
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain.schema import Document
+from langchain.embeddings.base import Embeddings
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_MAX_LENGTH = 256
+EMBEDDING_BATCH_SIZE = 64
+
+VECTOR_STORE_DIR = "data/vector_store"
+# Content-addressed float16 embeddings, reused across vector store rebuilds
+EMBEDDING_CACHE_DIR = "data/emb_cache"
+# LangChain's default collection name, so stores built by Chroma.from_documents still load
+COLLECTION_NAME = "langchain"
+
+# HNSW build parameters for bulk ingest: a wider construction beam and
+# batched index updates instead of per-insert neighbour searches.
+# encode_texts returns unit vectors, so inner product is cosine similarity
+HNSW_METADATA = {
+    "hnsw:space": "ip",
+    "hnsw:construction_ef": 200,
+    "hnsw:M": 32,
+    "hnsw:batch_size": 1000,
+    "hnsw:sync_threshold": 10000
+}
+INSERT_BATCH_SIZE = 1000
 
 # Singleton pattern for vector store
 _vector_store = None
 
+# Singleton tokenizer, ONNX session and query binding, shared by bulk ingest and query-time encoding
+_encoder = None
+_encoder_lock = threading.Lock()
+
+def _onnx_model_file() -> str:
+    """Pick the pre-quantized INT8 ONNX export matching this CPU, or FP32 if none fits."""
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "onnx/model_qint8_arm64.onnx"
+    
+    cpu_flags = set()
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    cpu_flags = set(line.split(":", 1)[1].split())
+                    break
+    except OSError:
+        pass
+    
+    if "avx512_vnni" in cpu_flags:
+        return "onnx/model_qint8_avx512_vnni.onnx"
+    if "avx2" in cpu_flags:
+        return "onnx/model_quint8_avx2.onnx"
+    return "onnx/model.onnx"
+
+def _load_encoder():
+    """Load the Rust tokenizer and a CPU ONNX Runtime session for the embedding model."""
+    tokenizer = Tokenizer.from_pretrained(EMBEDDING_MODEL_NAME)
+    # Pad each batch to its own longest sequence, not to a fixed length
+    tokenizer.enable_padding(length=None)
+    tokenizer.enable_truncation(max_length=EMBEDDING_MAX_LENGTH)
+    
+    # CPU-only session with full graph fusion; leave half the cores to the web server
+    sess_options = ort.SessionOptions()
+    sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    sess_options.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
+    
+    model_path = hf_hub_download(EMBEDDING_MODEL_NAME, _onnx_model_file())
+    session = ort.InferenceSession(model_path, sess_options, providers=["CPUExecutionProvider"])
+    
+    return tokenizer, session, _QueryBinding(session)
+
+class _QueryBinding:
+    """Preallocated batch-1 input and output buffers, bound to the session through IOBinding."""
+    
+    def __init__(self, session: ort.InferenceSession):
+        self.session = session
+        self.io_binding = session.io_binding()
+        self.lock = threading.Lock()
+        
+        output = session.get_outputs()[0]
+        self.output_name = output.name
+        self.dim = output.shape[-1]
+        
+        self.input_ids = np.zeros((1, EMBEDDING_MAX_LENGTH), dtype=np.int64)
+        self.attention_mask = np.zeros((1, EMBEDDING_MAX_LENGTH), dtype=np.int64)
+        self.inputs = {"input_ids": self.input_ids, "attention_mask": self.attention_mask}
+        if "token_type_ids" in {model_input.name for model_input in session.get_inputs()}:
+            # Single-segment queries: token types stay zero forever
+            self.inputs["token_type_ids"] = np.zeros((1, EMBEDDING_MAX_LENGTH), dtype=np.int64)
+        self.last_hidden_state = np.zeros((1, EMBEDDING_MAX_LENGTH, self.dim), dtype=np.float32)
+    
+    def run(self, ids: List[int], attention_mask: List[int]) -> np.ndarray:
+        """Run one tokenized query through the bound buffers and return its pooled vector."""
+        # Bind only the first `length` positions of each buffer; for a single row
+        # that prefix is contiguous, so short queries are not padded to the max length
+        length = len(ids)
+        with self.lock:
+            self.input_ids[0, :length] = ids
+            self.attention_mask[0, :length] = attention_mask
+            for name, buffer in self.inputs.items():
+                self.io_binding.bind_input(name, "cpu", 0, np.int64, (1, length), buffer.ctypes.data)
+            self.io_binding.bind_output(
+                self.output_name, "cpu", 0, np.float32, (1, length, self.dim), self.last_hidden_state.ctypes.data
+            )
+            self.session.run_with_iobinding(self.io_binding)
+            
+            # An unpadded single query attends to every token, so the masked mean is a plain mean
+            pooled = self.last_hidden_state[0, :length].mean(axis=0)
+        
+        return pooled / max(float(np.linalg.norm(pooled)), 1e-12)
+
+def _get_encoder():
+    """Get or lazily load the shared tokenizer, ONNX session and query binding."""
+    global _encoder
+    
+    if _encoder is None:
+        with _encoder_lock:
+            # Re-check under the lock so concurrent callers load the model only once
+            if _encoder is None:
+                _encoder = _load_encoder()
+    
+    return _encoder
+
+def encode_texts(texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE) -> np.ndarray:
+    """Embed texts into unit-length float32 vectors of shape (len(texts), dim)."""
+    tokenizer, session, _ = _get_encoder()
+    input_names = {model_input.name for model_input in session.get_inputs()}
+    
+    # Smart batching: encode in word-count order so each batch pads to a
+    # similar length, then restore the caller's order at the end
+    order = np.argsort([len(text.split()) for text in texts], kind="stable")
+    sorted_texts = [texts[i] for i in order]
+    
+    batches = []
+    for start in range(0, len(sorted_texts), batch_size):
+        encodings = tokenizer.encode_batch(sorted_texts[start:start + batch_size])
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+        last_hidden_state = session.run(None, feeds)[0]
+        
+        # Mean-pool over real tokens, then L2-normalize as the model's own pipeline does
+        mask = attention_mask.astype(np.float32)
+        pooled = np.einsum("bld,bl->bd", last_hidden_state, mask) / np.maximum(mask.sum(axis=1, keepdims=True), 1e-9)
+        pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+        batches.append(pooled.astype(np.float32, copy=False))
+    
+    if not batches:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.concatenate(batches)[np.argsort(order)]
+
+def encode_texts_cached(texts: List[str], cache_dir: str = EMBEDDING_CACHE_DIR, prune: bool = False) -> np.ndarray:
+    """
+    Embed texts like encode_texts, loading previously computed vectors from cache_dir.
+    
+    Entries live in a subdirectory per model export, since each quantized variant
+    yields different vectors. With prune=True, entries for texts not in this call
+    are deleted, so a full-corpus build keeps the cache at the corpus size.
+    """
+    model_key = f"{EMBEDDING_MODEL_NAME}/{_onnx_model_file()}"
+    model_dir = os.path.join(cache_dir, hashlib.sha256(model_key.encode("utf-8")).hexdigest()[:16])
+    os.makedirs(model_dir, exist_ok=True)
+    
+    paths = [
+        os.path.join(model_dir, hashlib.sha256(text.encode("utf-8")).hexdigest() + ".npy")
+        for text in texts
+    ]
+    
+    vectors = [None] * len(texts)
+    misses = []
+    for i, path in enumerate(paths):
+        if os.path.exists(path):
+            vectors[i] = np.load(path)
+        else:
+            misses.append(i)
+    
+    if misses:
+        computed = encode_texts([texts[i] for i in misses]).astype(np.float16)
+        for i, vector in zip(misses, computed):
+            vectors[i] = vector
+            # Write then rename so an interrupted build never leaves a truncated entry
+            tmp_path = f"{paths[i]}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, vector)
+            os.replace(tmp_path, paths[i])
+    
+    if prune:
+        current = {os.path.basename(path) for path in paths}
+        for name in os.listdir(model_dir):
+            if name not in current:
+                os.remove(os.path.join(model_dir, name))
+    
+    if not vectors:
+        return np.empty((0, 0), dtype=np.float32)
+    
+    # Fresh and cached vectors both went through float16, so they match exactly;
+    # renormalize so inner-product scores are true cosines after the rounding
+    stacked = np.stack(vectors).astype(np.float32)
+    stacked /= np.maximum(np.linalg.norm(stacked, axis=1, keepdims=True), 1e-12)
+    return stacked
+
+def encode_query(text: str) -> np.ndarray:
+    """Embed a single query into a unit-length float32 vector, reusing the preallocated buffers."""
+    tokenizer, _, query_binding = _get_encoder()
+    encoding = tokenizer.encode(text)
+    return query_binding.run(encoding.ids, encoding.attention_mask)
+
+class OnnxEmbeddings(Embeddings):
+    """LangChain embeddings adapter over encode_texts and encode_query, used for query-time encoding."""
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of documents."""
+        return encode_texts(texts).tolist()
+    
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query string."""
+        return encode_query(text).tolist()
+
 def get_vector_store():
     """Get or initialize the vector store."""
     global _vector_store
@@ -16,10 +237,13 @@ def get_vector_store():
         return _vector_store
     
     # Check if the vector store exists
-    if os.path.exists("data/vector_store") and os.listdir("data/vector_store"):
+    if os.path.exists(VECTOR_STORE_DIR) and os.listdir(VECTOR_STORE_DIR):
         # Load existing vector store
-        embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-        _vector_store = Chroma(persist_directory="data/vector_store", embedding_function=embeddings)
+        _vector_store = Chroma(
+            client=chromadb.PersistentClient(path=VECTOR_STORE_DIR),
+            collection_name=COLLECTION_NAME,
+            embedding_function=OnnxEmbeddings()
+        )
     else:
         # Create and populate vector store
         _vector_store = create_vector_store()
@@ -28,15 +252,17 @@ def get_vector_store():
 
 def create_vector_store():
     """Create and populate the vector store with documents."""
-    os.makedirs("data/vector_store", exist_ok=True)
+    os.makedirs(VECTOR_STORE_DIR, exist_ok=True)
     
-    # Load data
-    documents = []
+    # Load data as parallel columns, ready for a single collection.add
+    texts = []
+    metadatas = []
+    ids = []
     
     # Load customer interactions
     if os.path.exists("data/crm/interactions.json"):
-        with open("data/crm/interactions.json", "r") as f:
-            interactions = json.load(f)
+        with open("data/crm/interactions.json", "rb") as f:
+            interactions = orjson.loads(f.read())
         
         for interaction in interactions:
             # Create document from interaction
@@ -51,12 +277,14 @@ def create_vector_store():
             # Extract the content
             content = f"Interaction with customer {interaction['customer_id']} on {interaction['date']}: {interaction['notes']}"
             
-            documents.append(Document(page_content=content, metadata=metadata))
+            texts.append(content)
+            metadatas.append(metadata)
+            ids.append(metadata["document_id"])
     
     # Load product information
     if os.path.exists("data/products/product_catalog.json"):
-        with open("data/products/product_catalog.json", "r") as f:
-            product_catalog = json.load(f)
+        with open("data/products/product_catalog.json", "rb") as f:
+            product_catalog = orjson.loads(f.read())
         
         for category, products in product_catalog.items():
             for product in products:
@@ -71,7 +299,9 @@ def create_vector_store():
                 # Extract the content
                 content = f"Product {product['name']} ({product['id']}): {product['description']}. Category: {category}. Price: ${product['base_price']} per {product['unit']}."
                 
-                documents.append(Document(page_content=content, metadata=metadata))
+                texts.append(content)
+                metadatas.append(metadata)
+                ids.append(metadata["document_id"])
     
     # Create knowledge base documents with paint industry information
     # These would typically come from company documentation, but we'll create some samples
@@ -139,17 +369,31 @@ def create_vector_store():
             "document_id": f"KB_{kb_doc['title'].replace(' ', '_')}"
         }
         
-        documents.append(Document(page_content=kb_doc["content"], metadata=metadata))
-    
-    # Create the vector store
-    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-    vector_store = Chroma.from_documents(
-        documents=documents,
-        embedding=embeddings,
-        persist_directory="data/vector_store"
+        texts.append(kb_doc["content"])
+        metadatas.append(metadata)
+        ids.append(metadata["document_id"])
+    
+    # Embed the whole corpus in one call; only texts missing from the on-disk cache
+    # reach the model, and encode_texts length-sorts the mixed short interactions,
+    # product blurbs and long KB entries before batching
+    vectors = encode_texts_cached(texts, prune=True).tolist()
+    
+    # Create the vector store and insert the precomputed vectors directly.
+    # PersistentClient writes through to disk, so no separate persist() is needed
+    vector_store = Chroma(
+        client=chromadb.PersistentClient(path=VECTOR_STORE_DIR),
+        collection_name=COLLECTION_NAME,
+        embedding_function=OnnxEmbeddings(),
+        collection_metadata=HNSW_METADATA
     )
     
-    # Persist to disk
-    vector_store.persist()
+    for start in range(0, len(texts), INSERT_BATCH_SIZE):
+        end = start + INSERT_BATCH_SIZE
+        vector_store._collection.add(
+            ids=ids[start:end],
+            embeddings=vectors[start:end],
+            metadatas=metadatas[start:end],
+            documents=texts[start:end]
+        )
     
     return vector_store
\ No newline at end of file
@@ -1,13 +1,17 @@
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
-import shutil
+import aiofiles
+import json
 import os
-from typing import List
+from typing import Dict, List
 import uuid
 from datetime import datetime
 from pydantic import BaseModel
 import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 # Import services
 from services.image_processor import ImageProcessor
@@ -28,18 +32,164 @@ app.add_middleware(
 # Initialize services
 paint_catalog = PaintCatalog()
 image_processor = ImageProcessor()
-room_visualizer = RoomVisualizer()
+
+# Visualization runs in worker processes rather than threads. The OpenCV blend and
+# encode release the GIL, but the rest of a request (prompt formatting, decode
+# bookkeeping, result handling) is Python that would otherwise contend with the
+# event loop. Each worker imports langchain and OpenCV, so the pool is capped
+# rather than sized to every core
+VIZ_POOL_MAX_WORKERS = min(4, os.cpu_count() or 1)
+VIZ_POOL = None
+_viz_pool_lock = threading.Lock()
+
+# Per-worker services, created once in _init_visualizer_worker. Each worker keeps
+# its own decoded-pixel cache, so only paths cross the process boundary
+_worker_visualizer = None
+_worker_image_processor = None
+
+def _init_visualizer_worker():
+    """Create the per-process RoomVisualizer and ImageProcessor when a pool worker starts"""
+    global _worker_visualizer, _worker_image_processor
+    _worker_visualizer = RoomVisualizer()
+    _worker_image_processor = ImageProcessor()
+
+def _warm_up_worker():
+    """No-op task; running it forces a pool worker to start and run its initializer"""
+    return None
+
+def _get_viz_pool():
+    """Get the visualization pool, starting it on first use"""
+    global VIZ_POOL
+    
+    if VIZ_POOL is None:
+        with _viz_pool_lock:
+            # Re-check under the lock so concurrent requests start only one pool
+            if VIZ_POOL is None:
+                VIZ_POOL = ProcessPoolExecutor(
+                    max_workers=VIZ_POOL_MAX_WORKERS,
+                    initializer=_init_visualizer_worker
+                )
+    
+    return VIZ_POOL
+
+def _replace_broken_viz_pool(broken_pool):
+    """Drop a pool whose worker died so the next _get_viz_pool starts a fresh one"""
+    global VIZ_POOL
+    
+    with _viz_pool_lock:
+        # Only the first request to notice the crash resets the pool; later ones
+        # would otherwise throw away the replacement it already started
+        if VIZ_POOL is broken_pool:
+            VIZ_POOL = None
+    broken_pool.shutdown(wait=False, cancel_futures=True)
+
+def _visualize(image_id, image_path, color, room_type, lighting, output_path):
+    """Run a visualization inside a pool worker; all arguments must be picklable"""
+    return _worker_visualizer.visualize(
+        image_path=image_path,
+        color=color,
+        room_type=room_type,
+        lighting=lighting,
+        output_path=output_path,
+        # Decoded in this worker on first use, then served from its cache
+        image_array=_worker_image_processor.get_array(image_id, image_path)
+    )
+
+# Uploads are streamed to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1 << 20
 
 # Create upload directory
 os.makedirs("data/uploads", exist_ok=True)
 os.makedirs("data/results", exist_ok=True)
 
+# image_id -> processed image path, persisted so lookups survive a restart. It lives
+# outside data/uploads so the fallback scan below can never mistake it for an upload.
+# Each entry is appended as one JSON line, so recording an upload never rewrites
+# the whole index; on load a later line for the same ID wins
+UPLOAD_INDEX_PATH = "data/upload_index.jsonl"
+IMAGE_PATHS: Dict[str, str] = {}
+if os.path.exists(UPLOAD_INDEX_PATH):
+    with open(UPLOAD_INDEX_PATH, "r") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A line torn by a crash mid-append; the rest of the index is intact
+                continue
+            IMAGE_PATHS[entry["image_id"]] = entry["path"]
+
+# IDs that missed both the index and the data/uploads scan, so repeat lookups of an
+# unknown ID skip the scan. The IDs come from clients, so the set is bounded
+MISSING_IMAGE_IDS_MAX = 4096
+_missing_image_ids = set()
+
+def _is_supported_image(head: bytes) -> bool:
+    """Check the leading bytes of an upload for a JPEG, PNG or WebP signature"""
+    return (
+        head[:3] == b"\xff\xd8\xff"
+        or head[:8] == b"\x89PNG\r\n\x1a\n"
+        or (head[:4] == b"RIFF" and head[8:12] == b"WEBP")
+    )
+
+async def _record_image_path(image_id: str, image_path: str):
+    """Add an image_id -> path entry to the index and append it to the index file"""
+    IMAGE_PATHS[image_id] = image_path
+    _missing_image_ids.discard(image_id)
+    async with aiofiles.open(UPLOAD_INDEX_PATH, "a") as f:
+        await f.write(json.dumps({"image_id": image_id, "path": image_path}) + "\n")
+
+async def _find_image_path(image_id: str):
+    """
+    Resolve an image_id to its image path via the index, falling back to scanning
+    data/uploads for uploads made before the index existed; hits are written back
+    """
+    image_path = IMAGE_PATHS.get(image_id)
+    if image_path and os.path.exists(image_path):
+        return image_path
+    if image_id in _missing_image_ids:
+        return None
+    
+    # Uploads are saved as "<image_id>_<timestamp><ext>", so match the ID up to the
+    # separator; a bare prefix match would let a short or empty ID hit any file.
+    # The directory can be large, so list it off the event loop
+    upload_files = await asyncio.get_running_loop().run_in_executor(None, os.listdir, "data/uploads")
+    image_files = [f for f in upload_files if f.startswith(f"{image_id}_")]
+    if not image_files:
+        if len(_missing_image_ids) >= MISSING_IMAGE_IDS_MAX:
+            _missing_image_ids.clear()
+        _missing_image_ids.add(image_id)
+        return None
+    
+    # Prefer the processed copy when one was made, as new uploads do
+    processed_path = f"data/processed/processed_{image_files[0]}"
+    image_path = processed_path if os.path.exists(processed_path) else f"data/uploads/{image_files[0]}"
+    
+    await _record_image_path(image_id, image_path)
+    return image_path
+
 class VisualizationRequest(BaseModel):
     image_id: str
     paint_color_id: str
     room_type: str = "living room"
     lighting_condition: str = "natural light"
 
+@app.on_event("startup")
+def start_visualizer_pool():
+    """Start the visualization workers ahead of the first request"""
+    # Creating the executor starts no processes; workers are only launched on
+    # submit. Submitting one no-op per worker, all before waiting, launches every
+    # worker and runs its initializer now rather than on the first /visualize
+    pool = _get_viz_pool()
+    warm_ups = [pool.submit(_warm_up_worker) for _ in range(VIZ_POOL_MAX_WORKERS)]
+    for future in warm_ups:
+        future.result()
+
+@app.on_event("shutdown")
+def stop_visualizer_pool():
+    """Stop the visualization worker pool"""
+    if VIZ_POOL is not None:
+        VIZ_POOL.shutdown(cancel_futures=True)
+
 @app.get("/")
 def read_root():
     return {"message": "Paints Room Visualizer API"}
@@ -60,8 +210,12 @@ def get_color(color_id: str):
 @app.post("/upload")
 async def upload_image(file: UploadFile = File(...)):
     """Upload a room image"""
-    if not file.content_type.startswith("image/"):
-        raise HTTPException(status_code=400, detail="File must be an image")
+    # Sniff the file signature rather than trusting the client's content type,
+    # and reject before anything is written to disk
+    head = await file.read(16)
+    await file.seek(0)
+    if not _is_supported_image(head):
+        raise HTTPException(status_code=400, detail="File must be a JPEG, PNG or WebP image")
     
     # Generate unique ID for the image
     image_id = str(uuid.uuid4())
@@ -70,12 +224,15 @@ async def upload_image(file: UploadFile = File(...)):
     
     # Save the uploaded file
     file_path = f"data/uploads/{filename}"
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    async with aiofiles.open(file_path, "wb") as buffer:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await buffer.write(chunk)
     
     # Process the image to prepare it for visualization
     processed_image_path = image_processor.process_image(file_path)
     
+    await _record_image_path(image_id, processed_image_path)
+    
     return {
         "image_id": image_id,
         "filename": filename,
@@ -92,27 +249,35 @@ async def visualize_room(request: VisualizationRequest):
         raise HTTPException(status_code=404, detail="Color not found")
     
     # Find the uploaded image
-    image_files = [f for f in os.listdir("data/uploads") if f.startswith(request.image_id)]
-    if not image_files:
+    image_path = await _find_image_path(request.image_id)
+    if not image_path:
         raise HTTPException(status_code=404, detail="Image not found")
     
-    image_path = f"data/uploads/{image_files[0]}"
-    
     # Generate visualization
     result_id = str(uuid.uuid4())
     result_path = f"data/results/{result_id}.jpg"
     
+    visualize_args = (
+        request.image_id,
+        image_path,
+        color,
+        request.room_type,
+        request.lighting_condition,
+        result_path
+    )
+    
     try:
         # This might take some time, so we'll make it non-blocking
         # For a real implementation, consider using background tasks or a queue
-        await asyncio.to_thread(
-            room_visualizer.visualize,
-            image_path=image_path,
-            color=color,
-            room_type=request.room_type,
-            lighting=request.lighting_condition,
-            output_path=result_path
-        )
+        loop = asyncio.get_running_loop()
+        pool = _get_viz_pool()
+        try:
+            await loop.run_in_executor(pool, _visualize, *visualize_args)
+        except BrokenProcessPool:
+            # A worker died (out of memory, or a crash in the native blend), which
+            # breaks the whole pool; replace it and retry this request once
+            _replace_broken_viz_pool(pool)
+            await loop.run_in_executor(_get_viz_pool(), _visualize, *visualize_args)
         
         return {
             "visualization_id": result_id,
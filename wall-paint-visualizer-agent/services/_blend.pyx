@@ -0,0 +1,32 @@
+# cython: language_level=3
+"""
+Fused in-place wall tint kernel
+
+Build with `python setup.py build_ext --inplace` from the project root.
+RoomVisualizer falls back to its OpenCV blend when this module is not built.
+"""
+cimport cython
+from cython.parallel cimport prange
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def blend(unsigned char[:, :, ::1] img, int c0, int c1, int c2, int alpha_num):
+    """
+    Lerp every pixel of a contiguous HxWx3 uint8 array towards (c0, c1, c2)
+    in place, in 8.8 fixed point: img += ((color - img) * alpha_num) >> 8
+    The color is given in the array's channel order.
+    """
+    cdef Py_ssize_t height = img.shape[0]
+    cdef Py_ssize_t width = img.shape[1]
+    cdef Py_ssize_t i, j
+    cdef int v
+
+    for i in prange(height, nogil=True):
+        for j in range(width):
+            v = img[i, j, 0]
+            img[i, j, 0] = <unsigned char>(v + (((c0 - v) * alpha_num) >> 8))
+            v = img[i, j, 1]
+            img[i, j, 1] = <unsigned char>(v + (((c1 - v) * alpha_num) >> 8))
+            v = img[i, j, 2]
+            img[i, j, 2] = <unsigned char>(v + (((c2 - v) * alpha_num) >> 8))
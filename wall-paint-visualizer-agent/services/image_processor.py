@@ -1,5 +1,7 @@
 from PIL import Image
 import os
+from collections import OrderedDict
+import cv2
 import numpy as np
 
 class ImageProcessor:
@@ -7,10 +9,20 @@ class ImageProcessor:
     Service for processing room images before visualization
     """
     
-    def __init__(self):
-        """Initialize the image processor service"""
+    def __init__(self, cache_size: int = 32):
+        """
+        Initialize the image processor service
+        
+        Args:
+            cache_size: Number of decoded processed images to keep in memory
+        """
         # Create directory for processed images
         os.makedirs("data/processed", exist_ok=True)
+        
+        # LRU cache of processed RGB arrays keyed by image_id, so repeated
+        # visualizations of one upload skip the JPEG decode
+        self.cache_size = cache_size
+        self._array_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
     
     def process_image(self, image_path: str) -> str:
         """
@@ -31,7 +43,14 @@ class ImageProcessor:
             base_width = 1024
             w_percent = base_width / float(img.size[0])
             h_size = int(float(img.size[1]) * float(w_percent))
-            img = img.resize((base_width, h_size), Image.LANCZOS)
+            
+            # For JPEGs, let the decoder downscale by 1/2, 1/4 or 1/8 in the DCT
+            # domain so we never decode more pixels than the target needs
+            if img.format == "JPEG":
+                img.draft("RGB", (base_width, h_size))
+            
+            # reducing_gap lets Pillow do a cheap integer reduce() before LANCZOS
+            img = img.resize((base_width, h_size), Image.LANCZOS, reducing_gap=3.0)
             
             # Ensure RGB mode (convert if needed)
             if img.mode != "RGB":
@@ -47,6 +66,45 @@ class ImageProcessor:
         except Exception as e:
             raise Exception(f"Error processing image: {str(e)}")
     
+    @staticmethod
+    def _read_rgb(image_path: str) -> np.ndarray:
+        """Decode an image file to an (H, W, 3) uint8 RGB array with OpenCV"""
+        # The visualizer decodes with cv2.imread on a miss; using the same decoder
+        # here keeps cached and freshly decoded pixels bit-identical
+        array = cv2.imread(image_path, cv2.IMREAD_COLOR)
+        if array is None:
+            raise ValueError(f"Could not read image: {image_path}")
+        return cv2.cvtColor(array, cv2.COLOR_BGR2RGB)
+    
+    def _cache_array(self, image_id: str, array: np.ndarray):
+        """Store a read-only, C-contiguous uint8 array, evicting the oldest entry"""
+        array = np.ascontiguousarray(array, dtype=np.uint8)
+        array.flags.writeable = False
+        
+        self._array_cache[image_id] = array
+        self._array_cache.move_to_end(image_id)
+        while len(self._array_cache) > self.cache_size:
+            self._array_cache.popitem(last=False)
+    
+    def get_array(self, image_id: str, image_path: str) -> np.ndarray:
+        """
+        Get the processed RGB pixels for an image, decoding and caching them on a miss
+        
+        Args:
+            image_id: ID the image was processed under
+            image_path: Path to the processed image, read when not cached
+            
+        Returns:
+            Read-only (H, W, 3) uint8 array
+        """
+        array = self._array_cache.get(image_id)
+        if array is None:
+            self._cache_array(image_id, self._read_rgb(image_path))
+            array = self._array_cache[image_id]
+        else:
+            self._array_cache.move_to_end(image_id)
+        return array
+    
     def enhance_image(self, image_path: str) -> str:
         """
         Enhance image quality for better visualization results
@@ -68,12 +126,16 @@ class ImageProcessor:
             img_array = np.array(img)
             
             # Simple contrast enhancement
-            # Using a basic linear mapping to stretch the histogram
-            p5 = np.percentile(img_array, 5)
-            p95 = np.percentile(img_array, 95)
+            # Using a basic linear mapping to stretch the histogram.
+            # Percentiles come from a 256-bin histogram instead of sorting every pixel
+            cdf = np.cumsum(np.bincount(img_array.ravel(), minlength=256))
+            p5 = self._percentile_from_cdf(cdf, 5)
+            p95 = self._percentile_from_cdf(cdf, 95)
             
             if p95 > p5:
-                img_array = np.clip((img_array - p5) * (255.0 / (p95 - p5)), 0, 255).astype(np.uint8)
+                # Apply the stretch as a 256-entry lookup table rather than per-pixel float math
+                lut = np.clip((np.arange(256) - p5) * (255.0 / (p95 - p5)), 0, 255).astype(np.uint8)
+                img_array = cv2.LUT(img_array, lut)
             
             # Convert back to PIL image
             enhanced_img = Image.fromarray(img_array)
@@ -90,6 +152,25 @@ class ImageProcessor:
             print(f"Enhancement warning: {str(e)}")
             return image_path
     
+    @staticmethod
+    def _percentile_from_cdf(cdf: np.ndarray, q: float) -> float:
+        """
+        Compute np.percentile's linear-interpolated value from a uint8 histogram CDF
+        
+        Args:
+            cdf: Cumulative pixel counts per value (length 256)
+            q: Percentile in [0, 100]
+            
+        Returns:
+            The percentile value, identical to np.percentile on the raw pixels
+        """
+        position = q / 100.0 * (cdf[-1] - 1)
+        lower = int(np.floor(position))
+        upper = min(lower + 1, int(cdf[-1]) - 1)
+        lower_value = np.searchsorted(cdf, lower, side="right")
+        upper_value = np.searchsorted(cdf, upper, side="right")
+        return lower_value + (position - lower) * (upper_value - lower_value)
+    
     def analyze_room(self, image_path: str) -> dict:
         """
         Analyze room characteristics to guide visualization
@@ -1,6 +1,7 @@
-import json
 import os
-from typing import Dict, List, Optional
+import numpy as np
+import orjson
+from typing import Dict, List, Optional, Tuple
 
 class PaintCatalog:
     """
@@ -15,13 +16,26 @@ class PaintCatalog:
             catalog_path: Path to the JSON catalog file. If None, uses mock data.
         """
         self.colors = {}
+        # Snapshot returned by get_all_colors; reset to None whenever the catalog changes
+        self._all_colors_cache: Optional[Tuple[Dict, ...]] = None
         
         if catalog_path and os.path.exists(catalog_path):
-            with open(catalog_path, 'r') as f:
-                self.colors = json.load(f)
+            with open(catalog_path, 'rb') as f:
+                self.colors = orjson.loads(f.read())
         else:
             # Mock color data if no catalog file is provided
             self._initialize_mock_catalog()
+        
+        self._build_indexes()
+    
+    def _build_indexes(self):
+        """Lay out the searchable fields as parallel lowercase columns, one row per color"""
+        self._all_colors_cache = None
+        colors = self.colors.values()
+        self._ids = np.array(list(self.colors.keys()), dtype=str)
+        self._name_lower = np.array([color["name"].lower() for color in colors], dtype=str)
+        self._family_lower = np.array([color["family"].lower() for color in colors], dtype=str)
+        self._desc_lower = np.array([color["description"].lower() for color in colors], dtype=str)
     
     def _initialize_mock_catalog(self):
         """Create a mock catalog with sample colors"""
@@ -190,7 +204,11 @@ class PaintCatalog:
         Returns:
             List of color dictionaries
         """
-        return list(self.colors.values())
+        if self._all_colors_cache is None:
+            self._all_colors_cache = tuple(self.colors.values())
+        # A fresh list per call, as before the cache, so callers may sort or extend it;
+        # copying the cached tuple skips walking the colors dict again
+        return list(self._all_colors_cache)
     
     def get_color_by_id(self, color_id: str) -> Optional[Dict]:
         """
@@ -215,15 +233,12 @@ class PaintCatalog:
             List of matching color dictionaries
         """
         query = query.lower()
-        results = []
-        
-        for color in self.colors.values():
-            if (query in color["name"].lower() or 
-                query in color["family"].lower() or 
-                query in color["description"].lower()):
-                results.append(color)
-        
-        return results
+        mask = (
+            (np.char.find(self._name_lower, query) >= 0)
+            | (np.char.find(self._family_lower, query) >= 0)
+            | (np.char.find(self._desc_lower, query) >= 0)
+        )
+        return [self.colors[color_id] for color_id in self._ids[mask]]
     
     def get_colors_by_family(self, family: str) -> List[Dict]:
         """
@@ -235,11 +250,8 @@ class PaintCatalog:
         Returns:
             List of color dictionaries in the specified family
         """
-        family = family.lower()
-        return [
-            color for color in self.colors.values() 
-            if color["family"].lower() == family
-        ]
+        idx = np.flatnonzero(self._family_lower == family.lower())
+        return [self.colors[color_id] for color_id in self._ids[idx]]
     
     def save_catalog(self, catalog_path: str):
         """
@@ -248,8 +260,9 @@ class PaintCatalog:
         Args:
             catalog_path: Path to save the catalog JSON
         """
-        with open(catalog_path, 'w') as f:
-            json.dump(self.colors, f, indent=2)
+        with open(catalog_path, 'wb') as f:
+            f.write(orjson.dumps(self.colors, option=orjson.OPT_INDENT_2))
+        self._all_colors_cache = None
 
 
 if __name__ == "__main__":
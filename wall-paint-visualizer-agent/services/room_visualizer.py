@@ -1,41 +1,72 @@
 import os
 import time
-from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import numpy as np
+import cv2
 from langchain.prompts import PromptTemplate
 
+# Optional fused Cython kernel (see setup.py); the OpenCV blend is used when it is not built
+try:
+    from services import _blend
+except ImportError:
+    _blend = None
+
+# The tint does ~4 arithmetic ops per 3 bytes read and 3 written (~0.67 ops/byte),
+# so it is memory-bound: what pays is moving fewer bytes (fused single-pass kernels,
+# 8-bit pixels) rather than wider SIMD. As in pygame-ce's BLEND_* blitters, 8-bit
+# lanes also pack 4x more pixels per register than float32 and 8x more than float64
+_BLEND_DTYPE = np.uint8
+
+# Fast preview encoder settings per output extension: quality-90 JPEG with 4:2:2
+# chroma and no Huffman optimization pass, and the cheapest zlib level for PNG
+_ENCODE_PARAMS = {
+    ".jpg": [cv2.IMWRITE_JPEG_QUALITY, 90, cv2.IMWRITE_JPEG_SAMPLING_FACTOR, cv2.IMWRITE_JPEG_SAMPLING_FACTOR_422, cv2.IMWRITE_JPEG_OPTIMIZE, 0],
+    ".jpeg": [cv2.IMWRITE_JPEG_QUALITY, 90, cv2.IMWRITE_JPEG_SAMPLING_FACTOR, cv2.IMWRITE_JPEG_SAMPLING_FACTOR_422, cv2.IMWRITE_JPEG_OPTIMIZE, 0],
+    ".png": [cv2.IMWRITE_PNG_COMPRESSION, 1],
+    ".webp": [cv2.IMWRITE_WEBP_QUALITY, 90],
+}
+
 class RoomVisualizer:
     """
     Service for generating room visualizations with new paint colors
     """
     
-    def __init__(self, model_id="timbrooks/instruct-pix2pix", use_auth_token=None):
+    # LangChain prompt template; the text is constant, so it is built once at import
+    # and shared by every instance. The template keeps the indentation it had when it
+    # was built in __init__, so the rendered prompt is unchanged
+    prompt_template = PromptTemplate(
+        input_variables=["room_type", "color_name", "hex_code", "color_family", "description", "lighting"],
+        template="""
+            Transform this room to have walls painted in {color_name} ({hex_code}), 
+            which is a {color_family} color that {description}.
+            This is a {room_type} with {lighting} conditions.
+            Keep all furniture, decorations, and architectural elements exactly the same.
+            Only change the wall color to {color_name}.
+            Make the result photorealistic with accurate lighting.
+            """
+    )
+    
+    def __init__(self, model_id="timbrooks/instruct-pix2pix", use_auth_token=None, simulate_latency=False):
         """
         Initialize the room visualizer
         
         Args:
             model_id: Hugging Face model ID for the text-to-image model
             use_auth_token: HuggingFace API token (if needed)
+            simulate_latency: Sleep to mimic model load and inference time (demo only)
         """
         self.model_id = model_id
+        self.simulate_latency = simulate_latency
         
         # For POC, we'll just simulate model loading
         self.model = None
         self.device = "cpu"
         print(f"Using device: {self.device}")
         
-        # For LangChain prompt template
-        self.prompt_template = PromptTemplate(
-            input_variables=["room_type", "color_name", "hex_code", "color_family", "description", "lighting"],
-            template="""
-            Transform this room to have walls painted in {color_name} ({hex_code}), 
-            which is a {color_family} color that {description}.
-            This is a {room_type} with {lighting} conditions.
-            Keep all furniture, decorations, and architectural elements exactly the same.
-            Only change the wall color to {color_name}.
-            Make the result photorealistic with accurate lighting.
-            """
-        )
+        # Memoize prompt formatting on the six scalar fields; wrapping the bound
+        # method per instance keeps the cache from being shared or holding other instances
+        self._format_prompt = lru_cache(maxsize=256)(self._render_prompt)
     
     def _load_model(self):
         """Simulate loading the model"""
@@ -43,10 +74,11 @@ class RoomVisualizer:
             print(f"Loading model {self.model_id} on {self.device}...")
             
             # Simulate loading time
-            time.sleep(2)
+            if self.simulate_latency:
+                time.sleep(2)
             print("Model loaded!")
     
-    def visualize(self, image_path, color, room_type="living room", lighting="natural light", output_path=None):
+    def visualize(self, image_path, color, room_type="living room", lighting="natural light", output_path=None, image_array=None, preview_max_dim=1280, precision="uint8"):
         """
         Generate a visualization of a room with new paint color
         
@@ -56,6 +88,9 @@ class RoomVisualizer:
             room_type: Type of room (e.g., living room, bedroom)
             lighting: Lighting condition description
             output_path: Path to save the output image
+            image_array: Already-decoded RGB pixels of the room image; skips reading image_path
+            preview_max_dim: Longest side of the rendered preview in pixels; None keeps full size
+            precision: "uint8" for the fixed-point blend, "float" for exact per-channel rounding
             
         Returns:
             Path to the generated visualization
@@ -64,34 +99,33 @@ class RoomVisualizer:
             # Simulate loading the model
             self._load_model()
             
-            # Load the input image
-            input_image = Image.open(image_path)
+            # Load the input image as BGR, reusing decoded pixels when the caller has them
+            if image_array is not None:
+                img_array = cv2.cvtColor(image_array, cv2.COLOR_RGB2BGR)
+            else:
+                img_array = self._read_bgr(image_path)
+            img_array = self._fit_preview(img_array, preview_max_dim)
             
             # Generate the instruction prompt
-            instruction = self.prompt_template.format(
-                room_type=room_type,
-                color_name=color["name"],
-                hex_code=color["hex_code"],
-                color_family=color["family"].lower(),
-                description=color["description"].lower(),
-                lighting=lighting
-            )
+            instruction = self._build_instruction(color, room_type, lighting)
             
             print(f"Generating visualization with instruction: {instruction}")
             
             # Simulate processing time
-            time.sleep(3)
+            if self.simulate_latency:
+                time.sleep(3)
             
             # Apply a simple color overlay as a visual demonstration
-            output_image = self._simulate_room_color_change(input_image, color["rgb"])
+            # img_array is a private decode or conversion, so blend into it in place
+            output_array = self._simulate_room_color_change(img_array, color["rgb"], out=img_array, precision=precision)
             
             # Save the output image
             if output_path is None:
                 output_dir = "data/results"
                 os.makedirs(output_dir, exist_ok=True)
-                output_path = f"{output_dir}/visualization_{int(time.time())}.jpg"
+                output_path = f"{output_dir}/visualization_{int(time.time())}{self._output_extension(image_path)}"
             
-            output_image.save(output_path)
+            self._write_image(output_path, output_array)
             print(f"Visualization saved to {output_path}")
             
             return output_path
@@ -99,42 +133,151 @@ class RoomVisualizer:
         except Exception as e:
             raise Exception(f"Visualization failed: {str(e)}")
     
-    def _simulate_room_color_change(self, image, rgb_color):
+    def _build_instruction(self, color, room_type, lighting):
+        """Format the instruction prompt for one paint color"""
+        return self._format_prompt(
+            room_type,
+            color["name"],
+            color["hex_code"],
+            color["family"].lower(),
+            color["description"].lower(),
+            lighting
+        )
+    
+    def _render_prompt(self, room_type, color_name, hex_code, color_family, description, lighting):
+        """Run the LangChain template; called through the _format_prompt cache"""
+        return self.prompt_template.format(
+            room_type=room_type,
+            color_name=color_name,
+            hex_code=hex_code,
+            color_family=color_family,
+            description=description,
+            lighting=lighting
+        )
+    
+    def _read_bgr(self, image_path):
         """
-        Simulated color change for POC purposes
-        Handles images of different formats and dimensions
+        Decode an image file into an HxWx3 uint8 BGR array
+        Grayscale is expanded to three channels and alpha is dropped
+        """
+        img_array = cv2.imread(image_path, cv2.IMREAD_COLOR)
+        if img_array is None:
+            raise ValueError(f"Could not read image: {image_path}")
+        return img_array
+    
+    def _output_extension(self, image_path):
+        """Reuse the input's format for the result when it is one we encode, else JPEG"""
+        ext = os.path.splitext(image_path)[1].lower() if image_path else ""
+        return ext if ext in _ENCODE_PARAMS else ".jpg"
+    
+    def _fit_preview(self, img_array, preview_max_dim):
+        """
+        Downscale an image so its longest side is at most preview_max_dim
+        The blend and encode scale with pixel count, and a preview gains nothing
+        from full camera resolution
         """
-        # Convert to numpy array
-        img_array = np.array(image)
+        height, width = img_array.shape[:2]
+        if preview_max_dim is None or max(height, width) <= preview_max_dim:
+            return img_array
+        
+        scale = preview_max_dim / max(height, width)
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        # INTER_AREA averages source pixels, so large reductions do not alias
+        return cv2.resize(img_array, size, interpolation=cv2.INTER_AREA)
+    
+    def _write_image(self, output_path, img_array):
+        """Encode a BGR array to output_path, in the format its extension names"""
+        params = _ENCODE_PARAMS.get(os.path.splitext(output_path)[1].lower(), [])
+        if not cv2.imwrite(output_path, img_array, params):
+            raise ValueError(f"Could not write image: {output_path}")
+    
+    def _simulate_room_color_change(self, img_array, rgb_color, out=None, precision="uint8", tint_strength=0.3):
+        """
+        Simulated color change for POC purposes
+        Takes an HxWx3 uint8 BGR array and returns the tinted BGR array, written
+        into out when given (out may be img_array itself to blend in place)
         
-        # Check image dimensions and format
-        if len(img_array.shape) == 2:
-            # Convert grayscale to RGB
-            img_array = np.stack((img_array,) * 3, axis=-1)
-        elif len(img_array.shape) == 3 and img_array.shape[2] == 4:
-            # Handle RGBA images by removing alpha channel
-            img_array = img_array[:, :, :3]
+        The blend is memory-bound (see _BLEND_DTYPE), so the default "uint8"
+        precision uses the 8.8 fixed-point integer lerp: the native kernel when it
+        is built, otherwise the same arithmetic in NumPy, so both give identical
+        pixels. "float" weights in floating point and rounds each channel, for
+        callers that need exact rounding rather than results within 2 levels
         
-        # Get image dimensions
-        height, width, _ = img_array.shape
+        tint_strength sets how strong the tint effect is, from 0 (none) to 1
+        """
+        if precision not in ("uint8", "float"):
+            raise ValueError(f"Unknown blend precision: {precision}")
         
-        # Create properly shaped color overlay
-        color_layer = np.ones((height, width, 3), dtype=np.uint8)
-        color_layer[:, :, 0] = rgb_color[0]
-        color_layer[:, :, 1] = rgb_color[1]
-        color_layer[:, :, 2] = rgb_color[2]
+        # Skip the blend when it cannot change any pixel: no tint at all, or a tint so
+        # weak that even the farthest pixel value moves by under half a level
+        max_shift = tint_strength * max(max(int(c), 255 - int(c)) for c in rgb_color)
+        if max_shift < 0.5:
+            if out is None or out is img_array:
+                return img_array
+            np.copyto(out, img_array)
+            return out
         
         # Apply blending with controlled strength
-        tint_strength = 0.3  # How strong the tint effect is
-        blended = img_array * (1 - tint_strength) + color_layer * tint_strength
-        blended = np.clip(blended, 0, 255).astype(np.uint8)
+        if precision == "uint8":
+            alpha = int(tint_strength * 256)
+            
+            if _blend is not None and img_array.dtype == _BLEND_DTYPE and (out is None or out.flags.c_contiguous):
+                # Fused one-read-one-write integer lerp across OpenMP threads; it works in
+                # place, so copy first unless the caller handed over the input as out.
+                # The copy is always packed C order, so strided inputs (channel slices,
+                # crops) still reach the unit-stride kernel for no extra pass
+                if out is None:
+                    out = img_array.copy(order="C")
+                elif out is not img_array:
+                    np.copyto(out, img_array)
+                blue, green, red = (int(c) for c in rgb_color[::-1])
+                _blend.blend(out, blue, green, red, alpha)
+                return out
+            
+            # NumPy form of the kernel's img + ((color - img) * alpha >> 8): one widening
+            # into a single scratch buffer, updated in place. int16 holds the product
+            # for alpha <= 128 (tints up to 0.5); stronger tints need int32
+            work_dtype = np.int16 if alpha <= 128 else np.int32
+            color = np.asarray(rgb_color[::-1], dtype=work_dtype).reshape(1, 1, 3)
+            # dtype= makes np.subtract widen img chunk by chunk inside its C loop, so
+            # diff is the only widened buffer and no astype copy of img is made
+            diff = np.subtract(color, img_array, dtype=work_dtype)
+            np.multiply(diff, alpha, out=diff)
+            np.right_shift(diff, 8, out=diff)
+            if out is None:
+                out = np.empty_like(img_array)
+            # Likewise narrow back to uint8 inside the add; diff.astype(np.uint8)
+            # would allocate and write one more full-size array
+            np.add(img_array, diff, out=out, casting="unsafe")
+            return out
         
-        # Convert back to PIL Image
-        output_image = Image.fromarray(blended)
+        # out = img * (1 - t) + color * t as one saturating uint8 OpenCV pass. This is
+        # cv2.addWeighted against a constant color plane, with the plane folded into a
+        # per-channel bias column so it is never materialized
+        tint = np.zeros((3, 4), dtype=np.float32)
+        np.fill_diagonal(tint, 1 - tint_strength)
+        # Catalog colors are RGB; the pixels are BGR
+        tint[:, 3] = np.asarray(rgb_color[::-1], dtype=np.float32) * tint_strength
+        return cv2.transform(img_array, tint, dst=out)
+    
+    def _blend_and_save(self, img_array, color, room_type, lighting, output_path, precision="uint8"):
+        """
+        Render one color against a shared BGR array and save it
+        Only reads img_array, so it is safe to call from several threads at once
+        """
+        instruction = self._build_instruction(color, room_type, lighting)
+        print(f"Generating visualization with instruction: {instruction}")
         
-        return output_image
+        # Simulate processing time
+        if self.simulate_latency:
+            time.sleep(3)
+        
+        self._write_image(output_path, self._simulate_room_color_change(img_array, color["rgb"], precision=precision))
+        print(f"Visualization saved to {output_path}")
+        
+        return output_path
     
-    def compare_colors(self, image_path, colors, room_type="living room", lighting="natural light"):
+    def compare_colors(self, image_path, colors, room_type="living room", lighting="natural light", preview_max_dim=1280, precision="uint8"):
         """
         Generate visualizations for multiple colors for comparison
         
@@ -143,19 +286,53 @@ class RoomVisualizer:
             colors: List of color dictionaries
             room_type: Type of room
             lighting: Lighting condition description
+            preview_max_dim: Longest side of the rendered previews in pixels; None keeps full size
+            precision: "uint8" for the fixed-point blend, "float" for exact per-channel rounding
             
         Returns:
             List of paths to the generated visualizations
         """
-        result_paths = []
-        
-        for color in colors:
-            output_path = self.visualize(
-                image_path=image_path,
-                color=color,
-                room_type=room_type,
-                lighting=lighting
-            )
-            result_paths.append(output_path)
-        
-        return result_paths
\ No newline at end of file
+        try:
+            # Loop-invariant work runs once: model load and image decode
+            self._load_model()
+            img_array = self._fit_preview(self._read_bgr(image_path), preview_max_dim)
+            
+            output_dir = "data/results"
+            os.makedirs(output_dir, exist_ok=True)
+            timestamp = int(time.time())
+            ext = self._output_extension(image_path)
+            
+            # Colors share one timestamp, so each filename carries the color ID, or the
+            # list position for colors without one; a color listed twice gets its
+            # position appended so no two renders write the same file
+            output_paths = []
+            used_names = set()
+            for index, color in enumerate(colors):
+                name = str(color.get("id", index))
+                while name in used_names:
+                    name = f"{name}_{index}"
+                used_names.add(name)
+                output_paths.append(f"{output_dir}/visualization_{timestamp}_{name}{ext}")
+            
+            # Colors are independent and the blend and JPEG encode release the GIL,
+            # so render them concurrently against the shared read-only array. The
+            # native blend already spreads each color over every core with OpenMP, so
+            # with it two threads are enough to overlap one encode with the next blend;
+            # more would only oversubscribe the cores
+            if _blend is not None and precision == "uint8":
+                max_workers = min(len(colors), 2)
+            else:
+                max_workers = min(len(colors), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                result_paths = list(executor.map(
+                    lambda color, output_path: self._blend_and_save(
+                        img_array, color, room_type, lighting, output_path, precision=precision
+                    ),
+                    colors,
+                    output_paths
+                ))
+            
+            return result_paths
+            
+        except Exception as e:
+            raise Exception(f"Visualization failed: {str(e)}")
@@ -0,0 +1,32 @@
+"""
+Optional native extensions for the visualizer
+
+    pip install -r build-requirements.txt
+    python setup.py build_ext --inplace
+
+The default flags target the portable baseline for the compiler. Set
+BLEND_MARCH_NATIVE=1 to tune for the build host's CPU; the result then only
+runs on CPUs with the same instruction set extensions (or newer).
+"""
+import os
+
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+compile_args = ["-O3", "-fopenmp"]
+if os.environ.get("BLEND_MARCH_NATIVE") == "1":
+    compile_args.append("-march=native")
+
+extensions = [
+    Extension(
+        "services._blend",
+        ["services/_blend.pyx"],
+        extra_compile_args=compile_args,
+        extra_link_args=["-fopenmp"],
+    )
+]
+
+setup(
+    name="wall-paint-visualizer-native",
+    ext_modules=cythonize(extensions),
+)